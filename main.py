@@ -1,12 +1,20 @@
 import fitz
+import numpy as np
 import json
 import os
 import re
+import sys
 from pathlib import Path
-from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import cached_property, lru_cache
 import unicodedata
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Set up logging for better error handling
 logging.basicConfig(
     level=logging.INFO,
@@ -18,26 +26,123 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns used on the per-block hot paths
+_WS_RE = re.compile(r'\s+')
+_WS_RUN_RE = re.compile(r'\s\s|[^\S ]')
+_LEVEL_NUM_RE = re.compile(r'^(\d+(\.\d+)*)')
+_HEADING_NUM_RE = re.compile(r'^((\d+(\.\d+)*)|(Appendix\s+[A-Z])|([IVXLCDM]+\.))\b')
+_NOISE_RE = re.compile(r':|\/|www\.|\.com|address|required|waiver|parents|regular pathway', re.IGNORECASE | re.ASCII)
+_TITLE_KW_RE = re.compile(r'\b(title|abstract)\b', re.IGNORECASE)
+_TOC_DOTS_RE = re.compile(r'\s+\.{2,}\s*\d+')
+_TOC_NUM_PREFIX_RE = re.compile(r'(?<!\S)\d+(?:\.\d+)+(?=\s)')
+_CALL_TO_ACTION_RE = re.compile(r'([A-Z\s]+!)')
+
+@lru_cache(maxsize=8192)
 def clean_text(text):
     """Cleans text by normalizing whitespace, fixing OCR artifacts, and handling multilingual characters."""
     if not text:
         return ""
+    # ASCII text is already NFKC-normal and has no ligatures, so only whitespace needs work
+    if text.isascii():
+        if not _WS_RUN_RE.search(text):
+            return text.strip()
+        return _WS_RE.sub(' ', text).strip()
+    # Fast path: already NFKC (which also rules out ligatures) with only single spaces
+    if unicodedata.is_normalized('NFKC', text) and not _WS_RUN_RE.search(text):
+        return text.strip()
     # Normalize Unicode characters (e.g., for Japanese, Chinese, etc.)
     text = unicodedata.normalize('NFKC', text)
     # Replace common OCR artifacts
     text = text.replace("ﬁ", "fi").replace("ﬂ", "fl").strip()
     # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
     return text
 
+def get_block_text(block):
+    """Returns the raw span text of a block joined by spaces, assembling it only once per block."""
+    raw = block.get('_raw')
+    if raw is None:
+        raw = block['_raw'] = " ".join(s['text'] for l in block['lines'] for s in l['spans'])
+    return raw
+
+def get_span_size(span):
+    """Returns a span's font size rounded to a whole point, rounding it only once per span."""
+    size = span.get('_rsize')
+    if size is None:
+        size = span['_rsize'] = round(span['size'])
+    return size
+
+def iter_line_texts(page_dict):
+    """Yields the text of each line on a page, with its spans joined as in plain-text extraction."""
+    for block in page_dict["blocks"]:
+        if block['type'] == 0:
+            for line in block['lines']:
+                yield "".join(s['text'] for s in line['spans'])
+
 class BaseStrategy:
     """Base class for different document extraction strategies."""
-    def __init__(self, doc):
+    def __init__(self, doc, page_dicts=None):
         self.doc = doc
+        self._page_dicts = page_dicts if page_dicts is not None else {}
+        self._style_pool = {}
 
     def extract(self):
         raise NotImplementedError
 
+    def _get_page_dict(self, page_num):
+        """Returns the "dict" extraction of a page, parsing each page at most once."""
+        page_dict = self._page_dicts.get(page_num)
+        if page_dict is None:
+            page_dict = self._page_dicts[page_num] = self.doc[page_num].get_text("dict")
+        return page_dict
+
+    def _make_heading(self, text, page_num, size, is_bold, bbox):
+        """Builds a heading candidate, sharing repeated text and style objects between candidates."""
+        style = (size, is_bold)
+        return {'text': sys.intern(text), 'page': page_num, 'style': self._style_pool.setdefault(style, style), 'bbox': bbox}
+
+    def _extract_title(self):
+        """Extracts title using font size, centering, and keyword-based fallbacks."""
+        if self.doc.page_count == 0:
+            return ""
+        page_dict = self._get_page_dict(0)
+        page_width = page_dict['width']
+        blocks = [b for b in page_dict["blocks"] if b['type'] == 0 and b['bbox'][3] < page_dict['height'] * 0.6]
+        if not blocks:
+            return ""
+
+        # Primary: Look for largest font size in top half. A single pass tracks the
+        # running maximum and keeps spans that are close to it at the time they are seen.
+        top_size = 0.0
+        title_candidates = []
+        for b in blocks:
+            for l in b['lines']:
+                for s in l['spans']:
+                    if not s['text'].strip(): continue
+                    if s['size'] > top_size: top_size = s['size']
+                    if get_span_size(s) >= round(top_size * 0.9): title_candidates.append(s)
+        if title_candidates:
+            top_rounded = round(top_size)
+            title_text = " ".join(s['text'] for s in title_candidates if get_span_size(s) == top_rounded)
+            return clean_text(title_text)
+
+        # Fallback 1: Look for centered text
+        for block in blocks:
+            bbox = block['bbox']
+            center_pos = (bbox[0] + bbox[2]) / 2
+            if abs(center_pos - page_width / 2) < page_width * 0.25:
+                text = clean_text(get_block_text(block))
+                if text and len(text.split()) < 20:
+                    return text
+
+        # Fallback 2: Look for keywords like "Title" or "Abstract"
+        for block in blocks:
+            text = clean_text(get_block_text(block))
+            if _TITLE_KW_RE.search(text):
+                return text
+
+        return ""
+
     def _structure_headings(self, headings):
         """Assigns H1/H2/H3 levels based on style hierarchy and numbering."""
         if not headings: return []
@@ -45,28 +150,27 @@ class BaseStrategy:
         headings.sort(key=lambda h: (h['page'], h['bbox'][1]))
         
         heading_styles = sorted(list({h['style'] for h in headings}), key=lambda x: (x[0], x[1]), reverse=True)
+        style_rank = {style: rank for rank, style in enumerate(heading_styles)}
 
         outline = []
+        seen = set()
+        # Hierarchy is corrected as entries are emitted; the first heading keeps its own level
+        last_level_num = 3
         for h in headings:
-            match = re.match(r'^(\d+(\.\d+)*)', h['text'])
+            identifier = (h['text'], h['page'])
+            if identifier in seen: continue
+            seen.add(identifier)
+
+            match = _LEVEL_NUM_RE.match(h['text'])
             if match:
                 level = min(match.group(1).count('.') + 1, 3)
             else:
-                try:
-                    rank = heading_styles.index(h['style'])
-                    level = min(rank + 1, 3)
-                except ValueError: level = 3
+                level = min(style_rank.get(h['style'], 2) + 1, 3)
+            level = min(level, last_level_num + 1)
+            last_level_num = level
             outline.append({"level": f"H{level}", "text": h['text'], "page": h['page'] + 1})
 
-        unique_outline = []
-        seen = set()
-        for item in outline:
-            identifier = (item['text'], item['page'])
-            if identifier not in seen:
-                unique_outline.append(item)
-                seen.add(identifier)
-
-        return self._post_process_outline(unique_outline)
+        return outline
 
     def _post_process_outline(self, outline):
         """Corrects heading hierarchy."""
@@ -90,76 +194,69 @@ class TOCStrategy(BaseStrategy):
         outline = self._process_toc(toc)
         return {"title": title, "outline": outline}
 
-    def _extract_title(self):
-        """Extracts title using font size, centering, and keyword-based fallbacks."""
-        if self.doc.page_count == 0:
-            return ""
-        page = self.doc[0]
-        page_width = page.rect.width
-        blocks = [b for b in page.get_text("dict")["blocks"] if b['type'] == 0 and b['bbox'][3] < page.rect.height * 0.6]
-        if not blocks:
-            return ""
-
-        # Primary: Look for largest font size in top half
-        spans = [s for b in blocks for l in b['lines'] for s in l['spans'] if s['text'].strip()]
-        if spans:
-            top_size = max(s['size'] for s in spans)
-            title_candidates = [s for s in spans if round(s['size']) >= round(top_size * 0.9)]
-            if title_candidates:
-                title_text = " ".join(s['text'] for s in title_candidates if round(s['size']) == round(top_size))
-                return clean_text(title_text)
-
-        # Fallback 1: Look for centered text
-        for block in blocks:
-            bbox = block['bbox']
-            center_pos = (bbox[0] + bbox[2]) / 2
-            if abs(center_pos - page_width / 2) < page_width * 0.25:
-                text = clean_text(" ".join(s['text'] for l in block['lines'] for s in l['spans']))
-                if text and len(text.split()) < 20:
-                    return text
-
-        # Fallback 2: Look for keywords like "Title" or "Abstract"
-        for block in blocks:
-            text = clean_text(" ".join(s['text'] for l in block['lines'] for s in l['spans']))
-            if re.search(r'\b(title|abstract)\b', text, re.IGNORECASE):
-                return text
-
-        return ""
-
     def _process_toc(self, toc):
         outline = []
         for level, title, page in toc:
             if level <= 3:
-                cleaned_title = clean_text(re.sub(r'\s+\.{2,}\s*\d+', '', title))
+                cleaned_title = clean_text(_TOC_DOTS_RE.sub('', title))
                 if len(cleaned_title) > 2 and not cleaned_title.isdigit():
-                    sub_headings = re.split(r'(?=\d+(\.\d+)+\s)', cleaned_title)
-                    for sub_heading in sub_headings:
-                        if sub_heading.strip():
-                            outline.append({"level": f"H{level}", "text": sub_heading.strip(), "page": page + 1})
+                    # Split entries that run several numbered headings together, cutting
+                    # just before each standalone "1.2"-style number in a single scan.
+                    cuts = [m.start() for m in _TOC_NUM_PREFIX_RE.finditer(cleaned_title)]
+                    for start, end in zip([0] + cuts, cuts + [len(cleaned_title)]):
+                        sub_heading = cleaned_title[start:end].strip()
+                        if sub_heading:
+                            outline.append({"level": f"H{level}", "text": sub_heading, "page": page + 1})
         return self._post_process_outline(outline)
 
 
 class HeuristicStrategy(BaseStrategy):
     """Generic strategy for standard, text-heavy documents based on scoring text properties."""
-    def __init__(self, doc):
-        super().__init__(doc)
-        self.font_stats = self._analyze_font_stats()
-        self.body_size = self._get_dominant_font_size()
-
-    def _analyze_font_stats(self):
-        counts = Counter()
-        for page in self.doc:
-            for block in page.get_text("dict", flags=0)["blocks"]:
-                if block['type'] == 0:
-                    for line in block["lines"]:
-                        for span in line["spans"]:
-                            if span['text'].strip():
-                                counts[round(span['size'])] += len(span['text'].strip())
-        return counts
+    # Document-wide statistics are computed on first access, so strategies
+    # that never need them (e.g. FormStrategy) skip the full-document walk.
+    @cached_property
+    def _span_summary(self):
+        return self._walk_spans()
+
+    @property
+    def font_stats(self):
+        return self._span_summary[0]
+
+    @property
+    def _block_records(self):
+        return self._span_summary[1]
+
+    @cached_property
+    def body_size(self):
+        return self._get_dominant_font_size()
+
+    def _walk_spans(self):
+        """Single pass over every text span, collecting font statistics and per-block heading records."""
+        sizes = []
+        lengths = []
+        block_records = []
+        for page_num in range(self.doc.page_count):
+            for block in self._get_page_dict(page_num)["blocks"]:
+                if block['type'] != 0 or not block['lines']: continue
+                span_texts = []
+                for line in block["lines"]:
+                    for span in line["spans"]:
+                        span_texts.append(span['text'])
+                        stripped = span['text'].strip()
+                        if stripped:
+                            sizes.append(get_span_size(span))
+                            lengths.append(len(stripped))
+                block['_raw'] = " ".join(span_texts)
+                first_span = block['lines'][0]['spans'][0]
+                is_bold = "bold" in first_span['font'].lower()
+                block_records.append((block['_raw'], block['bbox'], get_span_size(first_span), is_bold, page_num))
+        # Character count per rounded font size, indexed by size
+        counts = np.bincount(np.asarray(sizes, dtype=np.int32), weights=np.asarray(lengths, dtype=np.int32))
+        return counts, block_records
 
     def _get_dominant_font_size(self):
-        if not self.font_stats: return 10
-        return self.font_stats.most_common(1)[0][0]
+        if not self.font_stats.size: return 10
+        return int(self.font_stats.argmax())
 
     def extract(self):
         title = self._extract_title()
@@ -167,66 +264,30 @@ class HeuristicStrategy(BaseStrategy):
         outline = self._structure_headings(headings)
         return {"title": title, "outline": outline}
 
-    def _extract_title(self):
-        """Extracts title using font size, centering, and keyword-based fallbacks."""
-        if self.doc.page_count == 0:
-            return ""
-        page = self.doc[0]
-        page_width = page.rect.width
-        blocks = [b for b in page.get_text("dict")["blocks"] if b['type'] == 0 and b['bbox'][3] < page.rect.height * 0.6]
-        if not blocks:
-            return ""
-
-        # Primary: Look for largest font size in top half
-        spans = [s for b in blocks for l in b['lines'] for s in l['spans'] if s['text'].strip()]
-        if spans:
-            top_size = max(s['size'] for s in spans)
-            title_candidates = [s for s in spans if round(s['size']) >= round(top_size * 0.9)]
-            if title_candidates:
-                title_text = " ".join(s['text'] for s in title_candidates if round(s['size']) == round(top_size))
-                return clean_text(title_text)
-
-        # Fallback 1: Look for centered text
-        for block in blocks:
-            bbox = block['bbox']
-            center_pos = (bbox[0] + bbox[2]) / 2
-            if abs(center_pos - page_width / 2) < page_width * 0.25:
-                text = clean_text(" ".join(s['text'] for l in block['lines'] for s in l['spans']))
-                if text and len(text.split()) < 20:
-                    return text
-
-        # Fallback 2: Look for keywords like "Title" or "Abstract"
-        for block in blocks:
-            text = clean_text(" ".join(s['text'] for l in block['lines'] for s in l['spans']))
-            if re.search(r'\b(title|abstract)\b', text, re.IGNORECASE):
-                return text
-
-        return ""
-
     def _find_headings(self):
         headings = []
-        for page_num, page in enumerate(self.doc):
-            blocks = page.get_text("dict")["blocks"]
-            for b in blocks:
-                if b['type'] != 0 or not b['lines']: continue
-                block_text = clean_text(" ".join(s['text'] for l in b['lines'] for s in l['spans']))
-                if not block_text: continue
-                if b['bbox'][1] < 50 or b['bbox'][3] > page.rect.height - 50: continue
-
-                score = 0
-                first_span = b['lines'][0]['spans'][0]
-                size = round(first_span['size'])
-                is_bold = "bold" in first_span['font'].lower()
-
-                if size > self.body_size: score += (size - self.body_size) * 5
-                if is_bold: score += 10
-                if len(block_text.split()) < 12: score += 10
-                if not block_text.endswith(('.', ':', ';')): score += 5
-                if re.match(r'^((\d+(\.\d+)*)|(Appendix\s+[A-Z])|([IVXLCDM]+\.))\b', block_text): score += 30
-                if len(block_text.split()) > 25 or ('.' in block_text[1:-1] and len(block_text) > 30): score -= 20
-
-                if score >= 25:
-                    headings.append({'text': block_text, 'page': page_num, 'style': (size, is_bold), 'bbox': b['bbox']})
+        body_size = self.body_size
+        for raw_text, bbox, size, is_bold, page_num in self._block_records:
+            if bbox[1] < 50 or bbox[3] > self._get_page_dict(page_num)['height'] - 50: continue
+            # Without a size or bold bonus, only a numbering prefix can lift a block to the
+            # threshold, so rule out body text by its first character before cleaning it.
+            if size <= body_size and not is_bold:
+                lead = unicodedata.normalize('NFKC', raw_text.lstrip()[:1])[:1]
+                if not (lead.isdigit() or lead in 'AIVXLCDM'): continue
+
+            block_text = clean_text(raw_text)
+            if not block_text: continue
+
+            score = 0
+            if size > body_size: score += (size - body_size) * 5
+            if is_bold: score += 10
+            if len(block_text.split()) < 12: score += 10
+            if not block_text.endswith(('.', ':', ';')): score += 5
+            if _HEADING_NUM_RE.match(block_text): score += 30
+            if len(block_text.split()) > 25 or ('.' in block_text[1:-1] and len(block_text) > 30): score -= 20
+
+            if score >= 25:
+                headings.append(self._make_heading(block_text, page_num, size, is_bold, bbox))
         return headings
 
 
@@ -245,22 +306,29 @@ class VisualLayoutStrategy(HeuristicStrategy):
     """
     def extract(self):
         headings = []
-        for page_num, page in enumerate(self.doc):
-            page_width = page.rect.width
-            blocks = sorted(page.get_text("dict")["blocks"], key=lambda b: b['bbox'][1])
+        for page_num in range(self.doc.page_count):
+            page_dict = self._get_page_dict(page_num)
+            page_width = page_dict['width']
+            blocks = sorted(page_dict["blocks"], key=lambda b: b['bbox'][1])
+
+            # Vertical gaps between consecutive blocks; 100 stands in for a missing neighbour.
+            tops = np.fromiter((b['bbox'][1] for b in blocks), dtype=np.float64, count=len(blocks))
+            bottoms = np.fromiter((b['bbox'][3] for b in blocks), dtype=np.float64, count=len(blocks))
+            gaps = tops[1:] - bottoms[:-1]
+            spaces_above = np.concatenate(([100.0], gaps)).tolist()
+            spaces_below = np.concatenate((gaps, [100.0])).tolist()
             
             for i, b in enumerate(blocks):
                 if b['type'] != 0 or not b['lines']: continue
 
-                block_text = clean_text(" ".join(s['text'] for l in b['lines'] for s in l['spans']))
+                block_text = clean_text(get_block_text(b))
                 if not block_text or len(block_text) < 4: continue
 
                 score = 0
                 bbox = b['bbox']
                 
                 # Cue 1: Vertical whitespace (Isolation). A large gap above is a strong signal.
-                space_above = bbox[1] - blocks[i-1]['bbox'][3] if i > 0 else 100
-                if space_above > 10: score += 25
+                if spaces_above[i] > 10: score += 25
                 
                 # Cue 2: Centering.
                 center_pos = (bbox[0] + bbox[2]) / 2
@@ -268,7 +336,7 @@ class VisualLayoutStrategy(HeuristicStrategy):
 
                 # Cue 3: Font size (Prominence).
                 first_span = b['lines'][0]['spans'][0]
-                size = round(first_span['size'])
+                size = get_span_size(first_span)
                 if size > self.body_size + 1: score += (size - self.body_size) * 5
                 
                 # Cue 4: Brevity and Case.
@@ -277,15 +345,13 @@ class VisualLayoutStrategy(HeuristicStrategy):
                 
                 # --- Contextual Penalties (Flexible) ---
                 # Penalize if it's part of a dense list.
-                space_below = blocks[i+1]['bbox'][1] - bbox[3] if i < len(blocks) - 1 else 100
-                if space_below < 8: score -= 25
+                if spaces_below[i] < 8: score -= 25
                 
                 # Penalize paragraph-like text.
                 if len(block_text.split()) > 10 or '.' in block_text[:-1]: score -= 25
                 
                 # Penalize labels or noisy text based on generic patterns.
-                noise_pattern = r':|\/|www\.|\.com|address|required|waiver|parents|regular pathway'
-                if re.search(noise_pattern, block_text, re.IGNORECASE):
+                if _NOISE_RE.search(block_text):
                     score -= 20 # Moderate penalty that can be overcome
                 
                 # Generic boost for short, exclamatory phrases (common in calls to action).
@@ -295,11 +361,11 @@ class VisualLayoutStrategy(HeuristicStrategy):
                 if score >= 40: # Higher threshold to ensure only strong candidates pass
                      is_bold = "bold" in first_span['font'].lower()
                      # If a call-to-action phrase is found, extract it cleanly.
-                     match = re.search(r'([A-Z\s]+!)', block_text)
+                     match = _CALL_TO_ACTION_RE.search(block_text)
                      if match:
-                         headings.append({'text': match.group(1).strip(), 'page': page_num, 'style': (size, is_bold), 'bbox': b['bbox']})
+                         headings.append(self._make_heading(match.group(1).strip(), page_num, size, is_bold, b['bbox']))
                      else:
-                         headings.append({'text': block_text, 'page': page_num, 'style': (size, is_bold), 'bbox': b['bbox']})
+                         headings.append(self._make_heading(block_text, page_num, size, is_bold, b['bbox']))
 
         outline = self._structure_headings(headings)
         return {"title": "", "outline": outline}
@@ -309,68 +375,94 @@ class PDFOutlineExtractor:
     """Dispatcher class that selects the appropriate strategy based on document characteristics."""
     def __init__(self, doc):
         self.doc = doc
+        # Page "dict" extractions shared with the selected strategy
+        self._page_dicts = {}
         self.strategy = self._get_strategy()
 
     def _get_strategy(self):
-        if self.doc.page_count == 0: return HeuristicStrategy(self.doc)
+        if self.doc.page_count == 0: return HeuristicStrategy(self.doc, self._page_dicts)
         
         toc = self.doc.get_toc()
         if toc and len(toc) > 5:
-            return TOCStrategy(self.doc)
+            return TOCStrategy(self.doc, self._page_dicts)
 
-        first_page_text = self.doc[0].get_text("text", flags=0).lower()
+        self._page_dicts[0] = self.doc[0].get_text("dict")
+        first_page_text = "\n".join(iter_line_texts(self._page_dicts[0])).lower()
         
         if "application form" in first_page_text or "grant of" in first_page_text:
-            return FormStrategy(self.doc)
+            return FormStrategy(self.doc, self._page_dicts)
 
         if self.doc.page_count <= 2:
-            total_words = sum(len(p.get_text("words")) for p in self.doc)
+            # Count words from the shared page dicts instead of a separate "words" extraction
+            total_words = 0
+            for page_num in range(self.doc.page_count):
+                if page_num not in self._page_dicts:
+                    self._page_dicts[page_num] = self.doc[page_num].get_text("dict")
+                total_words += sum(len(line.split()) for line in iter_line_texts(self._page_dicts[page_num]))
             if total_words < 800:
-                return VisualLayoutStrategy(self.doc)
+                return VisualLayoutStrategy(self.doc, self._page_dicts)
         
-        return HeuristicStrategy(self.doc)
+        return HeuristicStrategy(self.doc, self._page_dicts)
 
     def extract(self):
         return self.strategy.extract()
 
+def process_pdf(pdf_path, output_dir):
+    """Extracts the outline of a single PDF and writes it to output_dir as JSON."""
+    logger.info(f"Processing {pdf_path.name}...")
+    output_path = output_dir / f"{pdf_path.stem}.json"
+    result = {"title": "", "outline": []}
+
+    try:
+        # The context manager closes the document even when extraction fails
+        with fitz.open(pdf_path, filetype="pdf") as doc:
+            extractor = PDFOutlineExtractor(doc)
+            result = extractor.extract()
+        
+        # Ensure no trailing spaces in output
+        title = result.get('title', "")
+        if title:
+            result['title'] = title.strip()
+        
+        for item in result.get('outline', []):
+            item['text'] = item['text'].strip()
+        
+        logger.info(f"Successfully processed {pdf_path.name}")
+    except fitz.FileDataError as e:
+        logger.error(f"Corrupted PDF file {pdf_path.name}: {str(e)}")
+    except MemoryError as e:
+        logger.error(f"Memory error processing {pdf_path.name}: {str(e)}")
+    except Exception as e:
+        logger.error(f"Unexpected error processing {pdf_path.name}: {str(e)}")
+    
+    try:
+        if orjson is not None:
+            output_path.write_bytes(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        logger.error(f"Failed to write output for {pdf_path.name}: {str(e)}")
+
 def main():
     """Main execution function to process all PDFs in the input directory."""
     input_dir = Path(os.environ.get("INPUT_DIR", "/app/input"))
     output_dir = Path(os.environ.get("OUTPUT_DIR", "/app/output"))
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    for pdf_path in input_dir.glob("*.pdf"):
-        logger.info(f"Processing {pdf_path.name}...")
-        output_path = output_dir / f"{pdf_path.stem}.json"
-        result = {"title": "", "outline": []}
-
-        try:
-            doc = fitz.open(pdf_path)
-            extractor = PDFOutlineExtractor(doc)
-            result = extractor.extract()
-            doc.close()
-            
-            # Ensure no trailing spaces in output
-            title = result.get('title', "")
-            if title:
-                result['title'] = title.strip()
-            
-            for item in result.get('outline', []):
-                item['text'] = item['text'].strip()
-            
-            logger.info(f"Successfully processed {pdf_path.name}")
-        except fitz.FileDataError as e:
-            logger.error(f"Corrupted PDF file {pdf_path.name}: {str(e)}")
-        except MemoryError as e:
-            logger.error(f"Memory error processing {pdf_path.name}: {str(e)}")
-        except Exception as e:
-            logger.error(f"Unexpected error processing {pdf_path.name}: {str(e)}")
-        
-        try:
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(result, f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            logger.error(f"Failed to write output for {pdf_path.name}: {str(e)}")
+    pdf_paths = list(input_dir.glob("*.pdf"))
+    if not pdf_paths:
+        return
+
+    # Each PDF is independent, so spread them across worker processes
+    max_workers = min(len(pdf_paths), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(process_pdf, pdf_path, output_dir): pdf_path for pdf_path in pdf_paths}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Worker failed while processing {futures[future].name}: {str(e)}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file